@@ -0,0 +1,84 @@
+'''Batch runs solving every input file of a directory. Problems sharing the
+grid and the requested eigenstates are solved together. Every finished
+problem is recorded in the manifest of the output directory with the hash of
+its input, so an interrupted batch run is resumed by starting it again.'''
+
+import os
+from calculus._file_io import (_read_schrodinger, _write_solution_safe,
+                               _check_replaceable, _input_hash,
+                               _read_manifest, _append_manifest)
+from calculus.calc import solve_problem_batch, BATCH_KEYS
+import numpy as np
+
+
+MANIFEST = 'manifest.jsonl'
+
+
+def solve_directory(batchdir, outdirectory, energies_only=False, parity=True,
+                    chunksize=256):
+    """Solves every input file (`*.inp`) of a directory and writes the result
+    files into a subdirectory of the output directory named after the input
+    file. Problems sharing the grid and the requested eigenstates are solved
+    together in batches of at most chunksize problems. Problems recorded in
+    the manifest with an unchanged input hash and an existing output
+    directory are skipped.
+
+    Args:
+        batchdir (str): Directory containing the input files
+        outdirectory (str): Directory to write the result directories into
+        energies_only (bool): If True, only the energies are calculated
+        parity (bool): If False, symmetric potentials are not detected
+        chunksize (int): Maximum number of problems solved together
+
+    Returns:
+        list: Names of the solved input files
+        dict: Errors of the input files which could not be read or whose
+          output directory may not be replaced, keyed by the names of the
+          input files
+    """
+    if chunksize < 1:
+        raise ValueError("The chunksize has to be positive.")
+    manifest = os.path.join(outdirectory, MANIFEST)
+    os.makedirs(outdirectory, exist_ok=True)
+    finished = _read_manifest(manifest)
+    recorded = set(entry['output'] for entry in finished.values())
+
+    groups = dict()
+    failed = dict()
+    for fname in sorted(os.listdir(batchdir)):
+        if not fname.endswith('.inp'):
+            continue
+        try:
+            inphash = _input_hash(batchdir, fname, energies_only, parity)
+            entry = finished.get(fname)
+            if entry is not None and entry['hash'] == inphash and \
+                    os.path.isdir(os.path.join(outdirectory, entry['output'])):
+                continue
+            output = os.path.splitext(fname)[0]
+            _check_replaceable(os.path.join(outdirectory, output),
+                               output in recorded)
+            inp = _read_schrodinger(batchdir, fname)
+        except (OSError, ValueError, IndexError) as exc:
+            failed[fname] = exc
+            continue
+        key = tuple(inp[key] for key in BATCH_KEYS)
+        groups.setdefault(key, []).append((fname, inphash, inp))
+
+    solved = []
+    for problems in groups.values():
+        for start in range(0, len(problems), chunksize):
+            chunk = problems[start:start + chunksize]
+            result = solve_problem_batch([inp for _, _, inp in chunk],
+                                         energies_only, parity)
+            for ii, (fname, inphash, _) in enumerate(chunk):
+                output = os.path.splitext(fname)[0]
+                single = {key: value[ii] for key, value in result.items()}
+                if 'parity' in single and not np.any(single['parity']):
+                    del single['parity']
+                _write_solution_safe(os.path.join(outdirectory, output),
+                                     single, output in recorded)
+                _append_manifest(manifest, {'input': fname,
+                                            'hash': inphash,
+                                            'output': output})
+                solved.append(fname)
+    return solved, failed
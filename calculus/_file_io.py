@@ -4,6 +4,10 @@ files containing the calculated eigenstates, potential, etc.'''
 
 import os.path
 import os
+import itertools
+import hashlib
+import json
+import shutil
 import numpy as np
 
 
@@ -26,9 +30,57 @@ def _getvalue(string_with_data):
     return numbers
 
 
+def _read_pot_table(filepath):
+    """Reads a potential table stored in a separate file. Tables in the numpy
+    binary format (`.npy`) and raw binary tables of float64 xy-pairs (`.bin`)
+    are memory-mapped instead of being read into memory, any other file is
+    read as a text table.
+
+    Args:
+        filepath (str): Filepath of the potential table
+
+    Returns:
+        2darray: Array containing the x values and the potential as columns
+    """
+    extension = os.path.splitext(filepath)[1]
+    if extension == '.npy':
+        table = np.load(filepath, mmap_mode='r')
+    elif extension == '.bin':
+        table = np.memmap(filepath, dtype=np.float64, mode='r')
+        table = table.reshape((-1, 2))
+    else:
+        table = np.loadtxt(filepath)
+    if table.ndim != 2 or table.shape[1] != 2:
+        raise ValueError("Potential table '{}' has to contain two columns."
+                         .format(filepath))
+    return table
+
+
+def _is_table_reference(line):
+    """Checks if a line of the input file references an external potential
+    table instead of containing the first xy declaration.
+
+    Args:
+        line (str): Line following the header of the input file
+
+    Returns:
+        bool: True if the line names a file
+    """
+    content = line.split('#')[0].split()
+    if not content:
+        return False
+    try:
+        float(content[0])
+    except ValueError:
+        return True
+    return False
+
+
 def _read_schrodinger(directory, file):
     """Reads the file "schrodinger.inp" containing special formated user data
-    describing the problem
+    describing the problem. Instead of the xy declarations the sixth line may
+    contain the name of a file containing the potential table, relative to
+    the directory of the input file.
 
     Args:
         filepath (str): Filepath of "schrodinger.inp"
@@ -39,7 +91,9 @@ def _read_schrodinger(directory, file):
 
     filepath = directory + '/' + file
 
-    list_of_data = open(filepath, 'r').readlines()
+    # Only the header is read line by line, the table is parsed by numpy.
+    with open(filepath, 'r') as fp:
+        list_of_data = list(itertools.islice(fp, 6))
 
     alldata = dict()
 
@@ -63,7 +117,11 @@ def _read_schrodinger(directory, file):
     intpointsstring = list_of_data[4]
     alldata['interpolate_nr'] = _getvalue(intpointsstring)[0]
 
-    alldata['pot'] = np.loadtxt(filepath, skiprows=5)
+    if len(list_of_data) > 5 and _is_table_reference(list_of_data[5]):
+        tablefile = list_of_data[5].split('#')[0].split()[0]
+        alldata['pot'] = _read_pot_table(os.path.join(directory, tablefile))
+    else:
+        alldata['pot'] = np.loadtxt(filepath, skiprows=5)
 
     return alldata
 
@@ -119,6 +177,80 @@ def _read_files(filepath):
     return endata, expxdata, potdata, wfdata
 
 
+def _sweep_index(directories):
+    """Describes the result files of a sweep by their sizes and modification
+    times to detect changes of cached sweep data.
+
+    Args:
+        directories (list): Directories containing the result files
+
+    Returns:
+        list: Directory, sizes and modification times of its result files
+          for every directory
+    """
+    index = []
+    for directory in directories:
+        stats = []
+        for fname in ["energies.dat", "expvalues.dat", "potential.dat",
+                      "wavefuncs.dat"]:
+            stat = os.stat(os.path.join(directory, fname))
+            stats.append([stat.st_size, stat.st_mtime_ns])
+        index.append([directory, stats])
+    return index
+
+
+def _read_sweep(directories, cachedir=None):
+    """Reads the result files of several solutions on the same grid and stacks
+    them into arrays indexed by the sweep point. If a cache directory is
+    given, the stacked arrays are stored there in the numpy binary format and
+    are memory-mapped instead of reading the result files again, as long as
+    the cache was created from the same, unchanged result files.
+
+    Args:
+        directories (list): Directories containing the result files
+        cachedir (str): Directory of the cache, None for no cache
+
+    Returns:
+        2darray: Energies of every sweep point as rows
+        3darray: Expected values and uncertainties of every sweep point
+        3darray: Potentials and corresponding x-values of every sweep point
+        3darray: Eigenstates and corresponding x-values of every sweep point
+    """
+    names = ['energies', 'expvalues', 'potential', 'wavefuncs']
+    index = _sweep_index(directories)
+    if cachedir is not None:
+        indexfile = os.path.join(cachedir, 'sweep_index.json')
+        cachefiles = [os.path.join(cachedir, 'sweep_{}.npy'.format(name))
+                      for name in names]
+        if all(os.path.exists(ff) for ff in [indexfile] + cachefiles):
+            with open(indexfile, 'r') as fp:
+                cached = json.load(fp)
+            if cached == index:
+                return tuple(np.load(ff, mmap_mode='r') for ff in cachefiles)
+
+    stacks = [[] for _ in names]
+    for directory in directories:
+        endata, expxdata, potdata, wfdata = _read_files(directory)
+        stacks[0].append(np.atleast_1d(endata))
+        stacks[1].append(np.reshape(expxdata, (-1, 2)))
+        stacks[2].append(potdata)
+        stacks[3].append(wfdata)
+    arrays = tuple(np.stack(stack) for stack in stacks)
+
+    if cachedir is not None:
+        # The index is written last, so an incomplete cache is never used.
+        if os.path.exists(indexfile):
+            os.remove(indexfile)
+        # New files are moved over the old ones, which may still be mapped.
+        for cachefile, array in zip(cachefiles, arrays):
+            with open(cachefile + '.tmp', 'wb') as fp:
+                np.save(fp, array)
+            os.replace(cachefile + '.tmp', cachefile)
+        with open(indexfile, 'w') as fp:
+            json.dump(index, fp)
+    return arrays
+
+
 def _create_files(filepath, endata, expxdata, potdata, wfdata):
     """
     Creates files containing the energies (`energies.dat`), expected values for
@@ -143,3 +275,155 @@ def _create_files(filepath, endata, expxdata, potdata, wfdata):
     np.savetxt(expxfile, expxdata)
     np.savetxt(potfile, potdata)
     np.savetxt(wffile, wfdata)
+
+
+def _write_solution(filepath, result):
+    """Writes the result of `solve_problem` into the result files. If the
+    result only contains energies, only `energies.dat` is written. The parity
+    of the eigenstates of symmetric potentials is written into `parity.dat`.
+
+    Args:
+        filepath (str): Filepath of the destination, in which the files should
+          be saved
+        result (dict): Dictionary returned by `solve_problem`
+    """
+    if 'wavefuncs' in result:
+        _create_files(filepath, result['energy'], result['expvalues'],
+                      result['potential'], result['wavefuncs'])
+    else:
+        _write_result(filepath, 'energies.dat', result['energy'])
+    if 'parity' in result:
+        np.savetxt(os.path.join(filepath, 'parity.dat'), result['parity'],
+                   fmt='%d')
+
+
+def _input_hash(directory, file, *options):
+    """Calculates the SHA-256 hash of an input file, of the potential table it
+    references and of further options influencing the result.
+
+    Args:
+        directory (str): Directory of the input file
+        file (str): Name of the input file
+        options: Further options which are included in the hash
+
+    Returns:
+        str: Hexadecimal hash
+    """
+    sha = hashlib.sha256()
+    filepath = os.path.join(directory, file)
+    filepaths = [filepath]
+    with open(filepath, 'r') as fp:
+        header = list(itertools.islice(fp, 6))
+    if len(header) > 5 and _is_table_reference(header[5]):
+        tablefile = header[5].split('#')[0].split()[0]
+        filepaths.append(os.path.join(directory, tablefile))
+    for path in filepaths:
+        with open(path, 'rb') as fp:
+            for chunk in iter(lambda: fp.read(1 << 20), b''):
+                sha.update(chunk)
+    sha.update(json.dumps(options).encode())
+    return sha.hexdigest()
+
+
+def _read_manifest(filepath):
+    """Reads the manifest of the finished problems of a batch run. A last
+    line which was not written completely is removed from the file, so new
+    entries can be appended.
+
+    Args:
+        filepath (str): Filepath of the manifest
+
+    Returns:
+        dict: Last entry of every input file, keyed by its name
+    """
+    entries = dict()
+    if not os.path.exists(filepath):
+        return entries
+    with open(filepath, 'rb+') as fp:
+        content = fp.read()
+        complete = content.rfind(b'\n') + 1
+        if complete < len(content):
+            fp.truncate(complete)
+    for line in content[:complete].decode().splitlines():
+        if line.strip():
+            entry = json.loads(line)
+            entries[entry['input']] = entry
+    return entries
+
+
+def _append_manifest(filepath, entry):
+    """Appends an entry to the manifest of a batch run and flushes it to the
+    disk.
+
+    Args:
+        filepath (str): Filepath of the manifest
+        entry (dict): Entry describing a finished problem
+    """
+    with open(filepath, 'a') as fp:
+        fp.write(json.dumps(entry, sort_keys=True) + '\n')
+        fp.flush()
+        os.fsync(fp.fileno())
+
+
+def _is_result_directory(dirpath):
+    """Checks if a directory only contains result files (`*.dat`).
+
+    Args:
+        dirpath (str): Path of the directory
+
+    Returns:
+        bool: True if the path is a directory only containing result files
+    """
+    if os.path.islink(dirpath) or not os.path.isdir(dirpath):
+        return False
+    for entry in os.scandir(dirpath):
+        if not entry.is_file(follow_symlinks=False) or \
+                not entry.name.endswith('.dat'):
+            return False
+    return True
+
+
+def _check_replaceable(filepath, replace=False):
+    """Checks that `_write_solution_safe` may replace the directory and its
+    temporary directory, if they exist.
+
+    Args:
+        filepath (str): Directory in which the files should be saved
+        replace (bool): If True, an existing directory may always be replaced
+
+    Raises:
+        OSError: If the directory or its temporary directory exists and may
+          not be replaced
+    """
+    for path, force in ((filepath, replace), (filepath + '.tmp', False)):
+        if os.path.lexists(path) and not force and \
+                not _is_result_directory(path):
+            raise OSError("'{}' exists and is not a result directory."
+                          .format(path))
+
+
+def _write_solution_safe(filepath, result, replace=False):
+    """Writes the result files like `_write_solution` into a temporary
+    directory first and moves it to the destination, when all files are
+    written. An existing directory is only replaced if it only contains
+    result files, for example when it was left over by an interrupted run,
+    or if replace is set.
+
+    Args:
+        filepath (str): Directory in which the files should be saved
+        result (dict): Dictionary returned by `solve_problem`
+        replace (bool): If True, an existing directory is always replaced
+
+    Raises:
+        OSError: If the directory or its temporary directory exists and may
+          not be replaced
+    """
+    _check_replaceable(filepath, replace)
+    tmppath = filepath + '.tmp'
+    if os.path.exists(tmppath):
+        shutil.rmtree(tmppath)
+    os.makedirs(tmppath)
+    _write_solution(tmppath, result)
+    if os.path.exists(filepath):
+        shutil.rmtree(filepath)
+    os.replace(tmppath, filepath)
@@ -0,0 +1,193 @@
+'''Service keeping the calculus modules loaded to solve many problems without
+starting a new solver process for each of them. The service listens on a unix
+socket. Every request and every response is one line of JSON.
+
+A request either describes the problem directly (`problem`, containing the
+entries of the dictionary returned by `_read_schrodinger`) or names the
+directory of an input file (`indir`, optionally `file`). With `energies_only`
+only the energies are calculated, with `parity` set to false symmetric
+potentials are not solved by even and odd states and with `engine` set to
+`numerov` the eigenstates are calculated by Numerov shooting. The result
+files are only written if an output directory (`outdir`) is given. Relative
+paths are interpreted relative to the working directory of the service.
+
+The problems are solved by a pool of worker processes. At most `queuesize`
+problems wait for a free worker, further requests are answered with the
+status `busy` and have to be resubmitted by the caller.'''
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from calculus._file_io import _read_schrodinger, _write_solution
+from calculus.calc import solve_problem
+
+
+_KEYS = ['mass', 'xmin', 'xmax', 'npoint', 'min_ev', 'max_ev', 'reg_type',
+         'pot']
+
+
+def _get_problem(request):
+    """Creates the dictionary describing the problem of a request.
+
+    Args:
+        request (dict): Decoded request
+
+    Returns:
+        dict: Dictionary containing the needed data for further calculations
+    """
+    if 'indir' in request:
+        return _read_schrodinger(request['indir'],
+                                 request.get('file', 'schrodinger.inp'))
+    inp = dict(request['problem'])
+    missing = [key for key in _KEYS if key not in inp]
+    if missing:
+        raise ValueError("Problem is missing {}.".format(', '.join(missing)))
+    inp['npoint'] = int(inp['npoint'])
+    inp['min_ev'] = int(inp['min_ev'])
+    inp['max_ev'] = int(inp['max_ev'])
+    inp['pot'] = np.array(inp['pot'], dtype=float)
+    return inp
+
+
+def _run_job(request):
+    """Solves the problem of a request. It is executed by the workers.
+
+    Args:
+        request (dict): Decoded request
+
+    Returns:
+        dict: Response containing the energies, unless only the energies
+          are requested the expected values and uncertainties and for
+          symmetric potentials the parity of the eigenstates
+    """
+    inp = _get_problem(request)
+    result = solve_problem(inp, request.get('energies_only', False),
+                           request.get('parity', True),
+                           request.get('engine', 'matrix'))
+    if request.get('outdir') is not None:
+        _write_solution(request['outdir'], result)
+    response = dict()
+    response['status'] = 'ok'
+    response['energy'] = np.atleast_1d(result['energy']).tolist()
+    if 'expvalues' in result:
+        response['expvalues'] = np.atleast_2d(result['expvalues']).tolist()
+    if 'parity' in result:
+        response['parity'] = np.atleast_1d(result['parity']).tolist()
+    return response
+
+
+def _remove_stale_socket(path):
+    """Removes the unix socket of a service which is not running anymore.
+
+    Args:
+        path (str): Path of the unix socket
+
+    Raises:
+        OSError: If the path is not a socket or a service is listening on it
+    """
+    if not os.path.exists(path):
+        return
+    if not stat.S_ISSOCK(os.stat(path).st_mode):
+        raise OSError("'{}' exists and is not a socket.".format(path))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except OSError:
+            os.remove(path)
+            return
+    raise OSError("A service is already listening on '{}'.".format(path))
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles the requests of one connection, one request per line."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.solve(line)
+            self.wfile.write((json.dumps(response) + '\n').encode())
+            self.wfile.flush()
+
+
+class SolveServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server passing the requests to a pool of workers.
+
+    Args:
+        path (str): Path of the unix socket
+        nworkers (int): Number of worker processes
+        queuesize (int): Number of problems which may wait for a free worker
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, nworkers, queuesize):
+        _remove_stale_socket(path)
+        super().__init__(path, _RequestHandler)
+        self.pool = ProcessPoolExecutor(max_workers=nworkers)
+        self.slots = threading.BoundedSemaphore(nworkers + queuesize)
+
+    def solve(self, line):
+        """Solves the problem of one request line.
+
+        Args:
+            line (bytes): JSON encoded request
+
+        Returns:
+            dict: Response to the request
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as exc:
+            return {'status': 'error', 'message': str(exc)}
+        if not self.slots.acquire(blocking=False):
+            return {'status': 'busy', 'message': 'The queue is full.'}
+        try:
+            return self.pool.submit(_run_job, request).result()
+        except Exception as exc:
+            return {'status': 'error', 'message': str(exc)}
+        finally:
+            self.slots.release()
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def serve(path, nworkers, queuesize):
+    """Runs the service until it is interrupted.
+
+    Args:
+        path (str): Path of the unix socket
+        nworkers (int): Number of worker processes
+        queuesize (int): Number of problems which may wait for a free worker
+    """
+    with SolveServer(path, nworkers, queuesize) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def request(path, job):
+    """Sends one request to the service and waits for the response.
+
+    Args:
+        path (str): Path of the unix socket
+        job (dict): Request
+
+    Returns:
+        dict: Response of the service
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall((json.dumps(job) + '\n').encode())
+        with sock.makefile('rb') as fp:
+            return json.loads(fp.readline())
@@ -1,8 +1,10 @@
 """Module containing all functions for numerical calculations."""
 
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import numpy as np
 import scipy as sp
 import scipy.interpolate
+import scipy.linalg.lapack
 
 
 def pot_calc(xplot, discrete_pot, interpoltype):
@@ -10,7 +12,10 @@ def pot_calc(xplot, discrete_pot, interpoltype):
 
     Args:
         xplot (1darray): Array containing the x values
-        discrete_pot (1darry) : Array containing data points of the potential
+        discrete_pot (2darray) : Array containing data points of the
+            potential. A memory-mapped table has to be sorted by the x
+            values (which is only checked for the part that is read), other
+            tables are sorted if needed.
         interpoltype (str): Type of the interpolation
 
     Returns:
@@ -18,17 +23,59 @@ def pot_calc(xplot, discrete_pot, interpoltype):
     """
     xx = discrete_pot[:, 0]
     yy = discrete_pot[:, 1]
+    mapped = isinstance(discrete_pot, np.memmap)
+    # A memory-mapped table is not scanned as a whole, its order is only
+    # checked where it is read.
+    if not mapped and np.any(np.diff(xx) < 0):
+        order = np.argsort(xx, kind='stable')
+        xx = xx[order]
+        yy = yy[order]
     if interpoltype == 'linear':
-        vv = scipy.interpolate.interp1d(xx, yy, 'linear')
+        if np.amin(xplot) < xx[0] or np.amax(xplot) > xx[-1]:
+            raise ValueError("A value of xplot is outside of the "
+                             "interpolation range.")
+        # Only the part of the (possibly memory-mapped) table which brackets
+        # xplot is read.
+        lower = max(np.searchsorted(xx, np.amin(xplot), side='right') - 1, 0)
+        upper = np.searchsorted(xx, np.amax(xplot), side='left') + 1
+        xx = xx[lower:upper]
+        yy = yy[lower:upper]
+        if mapped and np.any(np.diff(xx) < 0):
+            raise ValueError("A memory-mapped potential table has to be "
+                             "sorted by the x values.")
+        vv = np.interp(xplot, xx, yy)
     elif interpoltype == 'polynomial':
         vv = sp.interpolate.barycentric_interpolate(xx, yy, xplot)
     elif interpoltype == 'cspline':
         vv = sp.interpolate.CubicSpline(xx, yy, bc_type='natural')
-    if interpoltype in ['linear', 'cspline']:
         vv = vv(xplot)
     return vv
 
 
+def _hamiltonian(xmin, xmax, npoint, mass, pot):
+    """Calculates the main and off diagonal of the tridiagonal hamiltonian of
+    the discrete time independent schrodinger equation.
+
+    Args:
+        xmin (int): Minimum x value of the potential
+        xmax (int): Maximum x value of the potential
+        npoint (int): Number of discret points of x
+        mass (float): Mass of the particle
+        pot (1darray): Discret potential at the x values
+
+    Returns:
+        1darray: Main diagonal of the hamiltonian
+        1darray: Off diagonal of the hamiltonian
+    """
+    delta = abs(xmin - xmax) / npoint
+    const = 1 / (mass * delta**2)
+    # Calculating the off diagonal values.
+    offdiag = - 1 / 2 * const * np.ones((npoint - 1,), dtype=float)
+    # Calculating the main diagonal values.
+    maindiag = pot + const
+    return maindiag, offdiag
+
+
 def solve_seq(xmin, xmax, npoint, mass, pot):
     """Solves the discrete time independent schrodinger equation and returns
     the eigenvalues and eigenvectors
@@ -45,16 +92,747 @@ def solve_seq(xmin, xmax, npoint, mass, pot):
         1darray: Array containing the eigenvalues
         ndarray: Array containing the eigenvectors as column vectors
     """
-    delta = abs(xmin - xmax) / npoint
-    const = 1 / (mass * delta**2)
-    # Calculating the off diagonal values.
-    offdiag = - 1 / 2 * const * np.ones((npoint - 1,), dtype=float)
-    # Calculating the main diagonal values.
-    maindiag = pot + const
+    maindiag, offdiag = _hamiltonian(xmin, xmax, npoint, mass, pot)
     energy, evec = sp.linalg.eigh_tridiagonal(maindiag, offdiag)
     return energy, evec
 
 
+def solve_energies(xmin, xmax, npoint, mass, pot, min_ev=1, max_ev=None):
+    """Solves the discrete time independent schrodinger equation without
+    calculating any eigenvectors. If max_ev is given, only the eigenvalues
+    from the min_ev'th to the max_ev'th one are calculated.
+
+    Args:
+        xmin (int): Minimum x value of the potential
+        xmax (int): Maximum x value of the potential
+        npoint (int): Number of discret points of x
+        mass (float): Mass of the particle
+        pot (1darray): Discret potential at the x values
+        min_ev (int): Lower bound of the eigenvalues
+        max_ev (int): Upper bound of the eigenvalues, None for all of them
+
+    Returns:
+        1darray: Array containing the eigenvalues
+    """
+    maindiag, offdiag = _hamiltonian(xmin, xmax, npoint, mass, pot)
+    if max_ev is None:
+        energy = sp.linalg.eigh_tridiagonal(maindiag, offdiag,
+                                            eigvals_only=True)
+        energy = energy[min_ev - 1:]
+    else:
+        energy = sp.linalg.eigh_tridiagonal(maindiag, offdiag,
+                                            eigvals_only=True, select='i',
+                                            select_range=(min_ev - 1,
+                                                          max_ev - 1))
+    return energy
+
+
+def count_states(xmin, xmax, npoint, mass, pot, energy):
+    """Counts the eigenstates with an eigenvalue below the given energy using
+    the Sturm sequence of the tridiagonal hamiltonian. No eigenvalues are
+    calculated, the cost is linear in npoint and all thresholds are counted
+    in one pass over the grid. Eigenvalues within the floating point
+    precision of the hamiltonian of a threshold are not below it, so an
+    eigenvalue returned by `solve_energies` is not counted below itself.
+
+    Args:
+        xmin (int): Minimum x value of the potential
+        xmax (int): Maximum x value of the potential
+        npoint (int): Number of discret points of x
+        mass (float): Mass of the particle
+        pot (1darray): Discret potential at the x values
+        energy (float or 1darray): Energy threshold(s)
+
+    Returns:
+        int or 1darray: Number of eigenstates below the energy threshold(s)
+    """
+    maindiag, offdiag = _hamiltonian(xmin, xmax, npoint, mass, pot)
+    offsquare = offdiag[0]**2 if npoint > 1 else 0.0
+    # Pivot replacing an exactly vanishing one to avoid dividing by zero. It
+    # is positive, since the pivots decrease with the energy and an energy
+    # just below the threshold decides what is below it.
+    tiny = np.finfo(float).eps * max(np.amax(abs(maindiag)), 1.0)
+    # Rounding error of the eigenvalues calculated by LAPACK.
+    precision = 8 * np.finfo(float).eps * (np.amax(abs(maindiag))
+                                           + 2 * np.sqrt(offsquare))
+    shape = np.shape(energy)
+    energies = np.ravel(np.asarray(energy, dtype=float)) - precision
+    # All thresholds are processed together in one pass over the grid.
+    pivot = maindiag[0] - energies
+    count = np.zeros(energies.shape, dtype=int)
+    for aa in maindiag[1:]:
+        pivot[pivot == 0.0] = tiny
+        count += pivot < 0.0
+        pivot = aa - energies - offsquare / pivot
+    count += pivot < 0.0
+    count = count.reshape(shape)
+    if count.ndim == 0:
+        return int(count)
+    return count
+
+
+def _is_symmetric(pot, rtol=1e-10, atol=1e-10):
+    """Checks if the potential is symmetric about the centre of the grid.
+    Stacked potentials (as rows) are checked one by one.
+
+    Args:
+        pot (ndarray): Discret potential at the x values
+        rtol (float): Relative tolerance of the comparison
+        atol (float): Absolute tolerance of the comparison, relative to the
+            largest absolute value of the potential
+
+    Returns:
+        bool or 1darray: True if the potential is symmetric
+    """
+    atol = atol * np.maximum(np.amax(abs(pot), axis=-1, keepdims=True), 1.0)
+    symmetric = np.all(np.isclose(pot, pot[..., ::-1], rtol=rtol, atol=atol),
+                       axis=-1)
+    if symmetric.ndim == 0:
+        return bool(symmetric)
+    return symmetric
+
+
+def _parity_blocks(maindiag, offdiag):
+    """Splits the tridiagonal hamiltonian of a symmetric potential into the
+    blocks of the even and the odd eigenstates. The blocks are tridiagonal
+    and describe the left half of the grid (including the centre point for an
+    odd number of points). Stacked diagonals (indexed by the potential first)
+    are split into stacked blocks.
+
+    Args:
+        maindiag (ndarray): Main diagonal of the hamiltonian
+        offdiag (ndarray): Off diagonal of the hamiltonian
+
+    Returns:
+        tuple: Main and off diagonal of the even block
+        tuple: Main and off diagonal of the odd block
+    """
+    npoint = maindiag.shape[-1]
+    half = npoint // 2
+    if npoint % 2 == 1:
+        # The centre point couples to the symmetric combination of its two
+        # neighbours and vanishes for odd states.
+        evendiag = maindiag[..., :half + 1].copy()
+        evenoff = offdiag[..., :half].copy()
+        evenoff[..., -1] *= np.sqrt(2)
+        odddiag = maindiag[..., :half].copy()
+        oddoff = offdiag[..., :half - 1].copy()
+    else:
+        # The two centre points couple to each other.
+        evendiag = maindiag[..., :half].copy()
+        evendiag[..., -1] += offdiag[..., half - 1]
+        evenoff = offdiag[..., :half - 1].copy()
+        odddiag = maindiag[..., :half].copy()
+        odddiag[..., -1] -= offdiag[..., half - 1]
+        oddoff = offdiag[..., :half - 1].copy()
+    return (evendiag, evenoff), (odddiag, oddoff)
+
+
+def _unfold_parity(evec, npoint, parity):
+    """Calculates the eigenvectors on the whole grid from the eigenvectors of
+    one parity block. Stacked eigenvectors (indexed by the potential first)
+    are unfolded to stacked eigenvectors.
+
+    Args:
+        evec (ndarray): Eigenvectors of the block as column vectors
+        npoint (int): Number of discret points of x
+        parity (int): 1 for the even block, -1 for the odd block
+
+    Returns:
+        ndarray: Eigenvectors on the whole grid as column vectors
+    """
+    half = npoint // 2
+    shape = evec.shape[:-2] + (npoint, evec.shape[-1])
+    full = np.zeros(shape, dtype=float)
+    full[..., :half, :] = evec[..., :half, :] / np.sqrt(2)
+    full[..., npoint - half:, :] = parity * full[..., half - 1::-1, :]
+    if npoint % 2 == 1 and parity == 1:
+        full[..., half, :] = evec[..., half, :]
+    return full
+
+
+def solve_parity(xmin, xmax, npoint, mass, pot, max_ev=None,
+                 eigvals_only=False):
+    """Solves the discrete time independent schrodinger equation for a
+    potential which is symmetric about the centre of the grid. The even and
+    the odd eigenstates are calculated independently from two blocks of half
+    the size and merged in ascending order of the eigenvalues.
+
+    Args:
+        xmin (int): Minimum x value of the potential
+        xmax (int): Maximum x value of the potential
+        npoint (int): Number of discret points of x
+        mass (float): Mass of the particle
+        pot (1darray): Discret potential at the x values
+        max_ev (int): Number of the lowest eigenstates to calculate, None for
+            all of them
+        eigvals_only (bool): If True, no eigenvectors are calculated
+
+    Returns:
+        1darray: Array containing the eigenvalues
+        ndarray: Array containing the eigenvectors as column vectors (not
+          returned if eigvals_only is set)
+        1darray: Parity of the eigenstates, 1 for even and -1 for odd states
+    """
+    maindiag, offdiag = _hamiltonian(xmin, xmax, npoint, mass, pot)
+    blocks = _parity_blocks(maindiag, offdiag)
+
+    def _solve_block(block):
+        diag, off = block
+        # The lowest max_ev states overall are among the lowest max_ev states
+        # of each block.
+        if max_ev is None or max_ev >= len(diag):
+            select, select_range = 'a', None
+        else:
+            select, select_range = 'i', (0, max_ev - 1)
+        return sp.linalg.eigh_tridiagonal(diag, off, eigvals_only,
+                                          select=select,
+                                          select_range=select_range)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        solutions = list(executor.map(_solve_block, blocks))
+
+    if eigvals_only:
+        energies = [solutions[0], solutions[1]]
+    else:
+        energies = [solutions[0][0], solutions[1][0]]
+    energy = np.concatenate(energies)
+    parity = np.concatenate((np.ones(len(energies[0]), dtype=int),
+                             -np.ones(len(energies[1]), dtype=int)))
+    order = np.argsort(energy, kind='stable')[:max_ev]
+    if eigvals_only:
+        return energy[order], parity[order]
+    evec = np.hstack((_unfold_parity(solutions[0][1], npoint, 1),
+                      _unfold_parity(solutions[1][1], npoint, -1)))
+    return energy[order], evec[:, order], parity[order]
+
+
+def _solve_tridiagonal_batch(maindiags, offdiags, lower, upper,
+                             eigvals_only=False):
+    """Calculates the eigenstates from the lower'th to the upper'th one
+    (counted from zero) of stacked tridiagonal matrices.
+
+    Args:
+        maindiags (2darray): Main diagonals as rows
+        offdiags (2darray): Off diagonals as rows
+        lower (int): Index of the lowest eigenstate
+        upper (int): Index of the highest eigenstate
+        eigvals_only (bool): If True, no eigenvectors are calculated
+
+    Returns:
+        2darray: Eigenvalues of every matrix as rows
+        3darray: Eigenvectors indexed by matrix, row and eigenstate (not
+          returned if eigvals_only is set)
+    """
+    nbatch, npoint = maindiags.shape
+    energy = np.zeros((nbatch, upper - lower + 1), dtype=float)
+    if not eigvals_only:
+        evec = np.zeros((nbatch, npoint, upper - lower + 1), dtype=float)
+    for ii in range(nbatch):
+        solution = sp.linalg.eigh_tridiagonal(maindiags[ii], offdiags[ii],
+                                              eigvals_only, select='i',
+                                              select_range=(lower, upper),
+                                              check_finite=False)
+        if eigvals_only:
+            energy[ii] = solution
+        else:
+            energy[ii], evec[ii] = solution
+    if eigvals_only:
+        return energy
+    return energy, evec
+
+
+def _batch_hamiltonian(xmin, xmax, npoint, mass, pots):
+    """Calculates the main and off diagonals of the tridiagonal hamiltonians
+    of a batch of potentials on the same grid as stacked arrays.
+
+    Args:
+        xmin (int): Minimum x value of the potentials
+        xmax (int): Maximum x value of the potentials
+        npoint (int): Number of discret points of x
+        mass (float or 1darray): Mass of the particle for every potential
+        pots (2darray): Discret potentials at the x values as rows
+
+    Returns:
+        2darray: Main diagonals of the hamiltonians as rows
+        2darray: Off diagonals of the hamiltonians as rows
+    """
+    delta = abs(xmin - xmax) / npoint
+    const = 1 / (np.broadcast_to(mass, (len(pots),)) * delta**2)
+    maindiags = pots + const[:, np.newaxis]
+    offdiags = - 1 / 2 * const[:, np.newaxis] * np.ones((npoint - 1,))
+    return maindiags, offdiags
+
+
+def solve_batch(xmin, xmax, npoint, mass, pots, min_ev, max_ev,
+                eigvals_only=False):
+    """Solves the discrete time independent schrodinger equation for a batch
+    of potentials on the same grid. The hamiltonians are built as stacked
+    arrays and only the eigenstates from the min_ev'th to the max_ev'th one
+    are calculated.
+
+    Args:
+        xmin (int): Minimum x value of the potentials
+        xmax (int): Maximum x value of the potentials
+        npoint (int): Number of discret points of x
+        mass (float or 1darray): Mass of the particle for every potential
+        pots (2darray): Discret potentials at the x values as rows
+        min_ev (int): Lower bound of the eigenvalues
+        max_ev (int): Upper bound of the eigenvalues
+        eigvals_only (bool): If True, no eigenvectors are calculated
+
+    Returns:
+        2darray: Eigenvalues of every potential as rows
+        3darray: Eigenvectors indexed by potential, x value and eigenstate
+          (not returned if eigvals_only is set)
+    """
+    maindiags, offdiags = _batch_hamiltonian(xmin, xmax, npoint, mass, pots)
+    return _solve_tridiagonal_batch(maindiags, offdiags, min_ev - 1,
+                                    max_ev - 1, eigvals_only)
+
+
+def solve_parity_batch(xmin, xmax, npoint, mass, pots, min_ev, max_ev,
+                       eigvals_only=False):
+    """Solves the discrete time independent schrodinger equation for a batch
+    of potentials on the same grid, which are symmetric about the centre of
+    the grid. The even and the odd blocks of all hamiltonians (see
+    `solve_parity`) are solved as two stacks of half the size and merged in
+    ascending order of the eigenvalues.
+
+    Args:
+        xmin (int): Minimum x value of the potentials
+        xmax (int): Maximum x value of the potentials
+        npoint (int): Number of discret points of x
+        mass (float or 1darray): Mass of the particle for every potential
+        pots (2darray): Discret potentials at the x values as rows
+        min_ev (int): Lower bound of the eigenvalues
+        max_ev (int): Upper bound of the eigenvalues
+        eigvals_only (bool): If True, no eigenvectors are calculated
+
+    Returns:
+        2darray: Eigenvalues of every potential as rows
+        3darray: Eigenvectors indexed by potential, x value and eigenstate
+          (not returned if eigvals_only is set)
+        2darray: Parity of the eigenstates of every potential as rows, 1 for
+          even and -1 for odd states
+    """
+    maindiags, offdiags = _batch_hamiltonian(xmin, xmax, npoint, mass, pots)
+    energies, evecs, parities = [], [], []
+    for sign, (diags, offs) in zip((1, -1),
+                                   _parity_blocks(maindiags, offdiags)):
+        # The lowest max_ev states overall are among the lowest max_ev states
+        # of each block.
+        upper = min(max_ev, diags.shape[1]) - 1
+        solution = _solve_tridiagonal_batch(diags, offs, 0, upper,
+                                            eigvals_only)
+        if eigvals_only:
+            energies.append(solution)
+        else:
+            energies.append(solution[0])
+            evecs.append(_unfold_parity(solution[1], npoint, sign))
+        parities.append(np.full(energies[-1].shape, sign, dtype=int))
+    energy = np.concatenate(energies, axis=1)
+    order = np.argsort(energy, axis=1, kind='stable')[:, min_ev - 1:max_ev]
+    energy = np.take_along_axis(energy, order, axis=1)
+    parity = np.take_along_axis(np.concatenate(parities, axis=1), order,
+                                axis=1)
+    if eigvals_only:
+        return energy, parity
+    evec = np.take_along_axis(np.concatenate(evecs, axis=2),
+                              order[:, np.newaxis, :], axis=2)
+    return energy, evec, parity
+
+
+def _batch_observables(xplot, evec):
+    """Normalizes a batch of eigenvectors in place and calculates the
+    expected values of the position and their uncertainties.
+
+    Args:
+        xplot (1darray): x values
+        evec (3darray): Eigenvectors indexed by potential, x value and
+            eigenstate
+
+    Returns:
+        2darray: Expected values of the position of every potential as rows
+        2darray: Uncertainties of the position of every potential as rows
+    """
+    delta = abs(xplot[0] - xplot[1])
+    evec /= np.sqrt(delta * np.einsum('bnk,bnk->bk', evec, evec))[:, None, :]
+    density = evec * evec
+    expx = delta * np.einsum('bnk,n->bk', density, xplot)
+    expx2 = delta * np.einsum('bnk,n->bk', density, xplot**2)
+    uncert = np.sqrt(expx2 - expx * expx)
+    return expx, uncert
+
+
+def _numerov_factors(xplot, mass, pot, energy):
+    """Calculates the factors 1 + h^2 k^2 / 12 of the Numerov method.
+
+    Args:
+        xplot (1darray): Array containing the x values
+        mass (float): Mass of the particle
+        pot (1darray): Discret potential at the x values
+        energy (float): Energy of the integration
+
+    Returns:
+        1darray: Numerov factors at the x values
+    """
+    delta = abs(xplot[1] - xplot[0])
+    return 1 + delta**2 / 6 * mass * (energy - pot)
+
+
+# Initial and maximum number of points integrated by one LAPACK call.
+_NUMEROV_CHUNK = 4096
+
+_NUMEROV_MAXCHUNK = 65536
+
+
+def _numerov_integrate(factors, stop):
+    """Integrates the schrodinger equation with the Numerov method from the
+    left bound, where the wavefunction is zero, up to the given index. The
+    recurrence is solved in chunks as a lower triangular banded system by
+    LAPACK. Every chunk starts from the rescaled end of the previous one and
+    is halved if the wavefunction overflows.
+
+    Args:
+        factors (1darray): Numerov factors at the x values
+        stop (int): Last index to integrate to
+
+    Returns:
+        1darray: Unnormalized wavefunction at the first stop + 1 x values,
+          scaled to a largest absolute value of one
+        int: Number of nodes of the wavefunction up to the index stop
+    """
+    chunks = [np.array([0.0, 1.0])]
+    logscales = [0.0]
+    nodes = 0
+    tail = np.array([0.0, 1.0])
+    start = 2
+    size = _NUMEROV_CHUNK
+    while start <= stop:
+        end = min(start + size, stop + 1)
+        ff = factors[start:end]
+        # Row j of the system is the recurrence for the index start + j, the
+        # columns of the band only depend on the factor of their index.
+        band = np.vstack((ff, 10 * ff - 12, ff))
+        rhs = np.zeros((end - start, 1), dtype=float)
+        rhs[0] = (12 - 10 * factors[start - 1]) * tail[1] \
+            - factors[start - 2] * tail[0]
+        if end - start > 1:
+            rhs[1] = - factors[start - 1] * tail[1]
+        psi = sp.linalg.lapack.dtbtrs(band, rhs, uplo='L')[0][:, 0]
+        if size > 1 and not np.all(np.isfinite(psi)):
+            size //= 2
+            continue
+        negative = np.concatenate((tail[1:], psi)) < 0
+        nodes += np.count_nonzero(negative[1:] != negative[:-1])
+        scale = np.amax(abs(psi))
+        chunks.append(psi / scale)
+        logscales.append(logscales[-1] + np.log(scale))
+        tail = np.concatenate((tail, psi))[-2:] / scale
+        start = end
+        size = min(2 * size, _NUMEROV_MAXCHUNK)
+    logscales = np.array(logscales)
+    scales = np.exp(logscales - np.amax(logscales))
+    psi = np.concatenate([chunk * scale for chunk, scale
+                          in zip(chunks, scales)])
+    return psi[:stop + 1], nodes
+
+
+def _numerov_shoot(factors):
+    """Integrates the schrodinger equation with the Numerov method from the
+    left bound, where the wavefunction is zero, to the right bound.
+
+    Args:
+        factors (1darray): Numerov factors at the x values
+
+    Returns:
+        float: Rescaled value of the wavefunction at the right bound
+        int: Number of nodes of the wavefunction within the bounds, which is
+          the number of eigenstates with a lower energy
+    """
+    psi, nodes = _numerov_integrate(factors, len(factors) - 1)
+    return psi[-1], nodes
+
+
+def _numerov_match(xplot, mass, pot, energy):
+    """Integrates the schrodinger equation with the Numerov method from both
+    bounds and matches the two parts at the outermost classical turning
+    point.
+
+    Args:
+        xplot (1darray): Array containing the x values
+        mass (float): Mass of the particle
+        pot (1darray): Discret potential at the x values
+        energy (float): Energy of the integration
+
+    Returns:
+        1darray: Unnormalized wavefunction at the x values
+    """
+    factors = _numerov_factors(xplot, mass, pot, energy)
+    npoint = len(xplot)
+    allowed = np.nonzero(pot < energy)[0]
+    if len(allowed) > 0:
+        match = allowed[-1]
+    else:
+        match = npoint // 2
+    match = min(max(match, 2), npoint - 3)
+    left = _numerov_integrate(factors, match + 2)[0]
+    # The right part starts at the index match - 2.
+    right = _numerov_integrate(factors[::-1], npoint - match + 1)[0][::-1]
+    # Least squares match of the five points around the matching point,
+    # which is robust if the wavefunction has a node there.
+    window = right[0:5]
+    factor = np.dot(left[match - 2:match + 3], window) / np.dot(window, window)
+    return np.concatenate((left[:match], factor * right[2:]))
+
+
+def _numerov_rayleigh(xplot, mass, pot, lower, upper, psi):
+    """Refines an eigenstate of the Numerov method, whose eigenvalue is the
+    only one between lower and upper, by Rayleigh quotient iteration. With
+    the tridiagonal matrices A and B of the Numerov method the eigenstates
+    solve the symmetric eigenvalue problem (B^-1 A + V) psi = E psi, so every
+    iteration costs linear time.
+
+    Args:
+        xplot (1darray): Array containing the x values
+        mass (float): Mass of the particle
+        pot (1darray): Discret potential at the x values
+        lower (float): Lower bound of the eigenvalue
+        upper (float): Upper bound of the eigenvalue
+        psi (1darray): Approximation of the wavefunction
+
+    Returns:
+        float: Eigenvalue of the eigenstate, None if the iteration left the
+          bounds
+        1darray: Normalized wavefunction (None if the iteration left the
+          bounds)
+    """
+    delta = abs(xplot[1] - xplot[0])
+    const = 1 / (2 * mass * delta**2)
+    inner = pot[1:-1]
+    ones = np.ones_like(inner)
+    bband = np.vstack((ones, 10 * ones, ones)) / 12
+
+    def _pad(vec):
+        return np.concatenate(([0.0], vec, [0.0]))
+
+    def _quotient(vec):
+        # The kinetic part is summed over products of differences, since B
+        # and A commute, which avoids the cancellation of A psi.
+        solved = sp.linalg.solve_banded((1, 1), bband, vec,
+                                        check_finite=False)
+        kinetic = const * np.dot(np.diff(_pad(vec)), np.diff(_pad(solved)))
+        return (kinetic + np.dot(inner * vec, vec)) / np.dot(vec, vec)
+
+    vec = psi[1:-1] / np.linalg.norm(psi[1:-1])
+    energy = 0.5 * (lower + upper)
+    for _ in range(32):
+        offdiag = - const + (inner - energy) / 12
+        band = np.vstack((offdiag, 2 * const + 10 * (inner - energy) / 12,
+                          offdiag))
+        padded = _pad(vec)
+        rhs = (padded[:-2] + 10 * vec + padded[2:]) / 12
+        try:
+            new = sp.linalg.solve_banded((1, 1), band, rhs,
+                                         check_finite=False)
+        except np.linalg.LinAlgError:
+            # The shift is an eigenvalue within the floating point precision.
+            break
+        vec = new / np.linalg.norm(new)
+        quotient = _quotient(vec)
+        if not lower < quotient < upper:
+            return None, None
+        converged = abs(quotient - energy) <= 1e-13 * max(abs(quotient), 1.0)
+        energy = quotient
+        if converged:
+            break
+    return energy, _pad(vec) / np.sqrt(delta)
+
+
+def _numerov_state(xplot, mass, pot, index, eigvals_only=False):
+    """Calculates a single eigenstate with the Numerov method. The energy is
+    bracketed by bisection on the number of nodes until it is the only
+    eigenvalue within the bracket. It is refined by Rayleigh quotient
+    iteration (see `_numerov_rayleigh`) starting from the wavefunction
+    integrated from both bounds at the middle of the bracket, which is
+    bisected further while the iteration leaves it.
+
+    Args:
+        xplot (1darray): Array containing the x values
+        mass (float): Mass of the particle
+        pot (1darray): Discret potential at the x values
+        index (int): Number of the eigenstate, starting at 1
+        eigvals_only (bool): If True, the wavefunction is not returned
+
+    Returns:
+        float: Eigenvalue of the eigenstate
+        1darray: Normalized wavefunction (None if eigvals_only is set)
+    """
+    def _count(energy):
+        return _numerov_shoot(_numerov_factors(xplot, mass, pot, energy))[1]
+
+    lower = np.amin(pot)
+    upper = np.amax(pot) + 1.0
+    nlower = _count(lower)
+    nupper = _count(upper)
+    for _ in range(64):
+        if nupper >= index:
+            break
+        upper = lower + 2 * (upper - lower)
+        nupper = _count(upper)
+    else:
+        raise ValueError("Eigenstate {} could not be bracketed."
+                         .format(index))
+
+    energy = None
+    while True:
+        middle = 0.5 * (lower + upper)
+        if middle in (lower, upper):
+            break
+        if nlower == index - 1 and nupper == index:
+            energy, psi = _numerov_rayleigh(
+                xplot, mass, pot, lower, upper,
+                _numerov_match(xplot, mass, pot, middle))
+            if energy is not None:
+                break
+        nmiddle = _count(middle)
+        if nmiddle >= index:
+            upper, nupper = middle, nmiddle
+        else:
+            lower, nlower = middle, nmiddle
+    if energy is None:
+        # The eigenvalue is degenerate with its neighbours within the
+        # floating point precision, solve_numerov separates the eigenstates.
+        energy = 0.5 * (lower + upper)
+        psi = _numerov_inverse_iteration(
+            xplot, mass, pot, energy,
+            _numerov_match(xplot, mass, pot, energy)[:, np.newaxis])[:, 0]
+    if eigvals_only:
+        return energy, None
+    return energy, psi
+
+
+def _numerov_degenerate(xplot, mass, pot, energy, nstates):
+    """Calculates orthonormal wavefunctions of eigenstates which are
+    degenerate within the floating point precision. For a symmetric
+    potential the wavefunctions are chosen even and odd, even ones first.
+
+    Args:
+        xplot (1darray): Array containing the x values
+        mass (float): Mass of the particle
+        pot (1darray): Discret potential at the x values
+        energy (float): Eigenvalue of the eigenstates
+        nstates (int): Number of degenerate eigenstates
+
+    Returns:
+        ndarray: Normalized wavefunctions as column vectors
+    """
+    start = np.random.default_rng(0).standard_normal((len(xplot), nstates))
+    start[0] = 0.0
+    start[-1] = 0.0
+    psi = _numerov_inverse_iteration(xplot, mass, pot, energy, start)
+    if _is_symmetric(pot):
+        parity, rotation = np.linalg.eigh(np.dot(psi.T, psi[::-1]))
+        psi = np.dot(psi, rotation[:, ::-1])
+    return psi
+
+
+def _numerov_inverse_iteration(xplot, mass, pot, energy, psi):
+    """Refines one or more wavefunctions by inverse iteration with the
+    tridiagonal matrices A and B of the Numerov method written as the
+    generalized eigenvalue problem A psi = E B psi, which costs linear time
+    per iteration. Several wavefunctions are iterated as a block and kept
+    orthonormal, so they span the eigenspace of degenerate eigenstates.
+
+    Args:
+        xplot (1darray): Array containing the x values
+        mass (float): Mass of the particle
+        pot (1darray): Discret potential at the x values
+        energy (float): Eigenvalue of the wavefunctions
+        psi (ndarray): Approximation of the wavefunctions as column vectors
+
+    Returns:
+        ndarray: Orthonormal wavefunctions as column vectors
+    """
+    delta = abs(xplot[1] - xplot[0])
+    const = 1 / (2 * mass * delta**2)
+    # Both off diagonals of A - E B only depend on the column.
+    offdiag = - const + (pot[1:-1] - energy) / 12
+    band = np.vstack((offdiag, 2 * const + 10 * (pot[1:-1] - energy) / 12,
+                      offdiag))
+    psi = np.linalg.qr(psi)[0]
+    for _ in range(8):
+        rhs = (psi[:-2] + 10 * psi[1:-1] + psi[2:]) / 12
+        new = np.zeros_like(psi)
+        new[1:-1] = sp.linalg.solve_banded((1, 1), band, rhs)
+        new = np.linalg.qr(new)[0]
+        change = np.amax(abs(new - np.dot(psi, np.dot(psi.T, new))))
+        psi = new
+        if change < 1e-10:
+            break
+    return psi / np.sqrt(delta)
+
+
+def solve_numerov(xmin, xmax, npoint, mass, pot, min_ev, max_ev, nworkers=1,
+                  eigvals_only=False):
+    """Solves the time independent schrodinger equation with the Numerov
+    method for the eigenstates from the min_ev'th to the max_ev'th one. Each
+    eigenstate is found directly in linear time and memory by node counting
+    (see `_numerov_state`), the integrations and iterations over the grid run
+    in LAPACK. Its error decreases with the fourth power of the grid spacing
+    instead of the square as for `solve_seq`, so a much coarser grid gives
+    the same accuracy. Eigenstates which are degenerate within the
+    floating point precision are returned as an orthonormal set, which is
+    even and odd for a symmetric potential. Unlike `solve_seq`, the
+    wavefunctions are zero at xmin and xmax.
+
+    Args:
+        xmin (int): Minimum x value of the potential
+        xmax (int): Maximum x value of the potential
+        npoint (int): Number of discret points of x
+        mass (float): Mass of the particle
+        pot (1darray): Discret potential at the x values
+        min_ev (int): Lower bound of the eigenvalues
+        max_ev (int): Upper bound of the eigenvalues
+        nworkers (int): Number of processes calculating the eigenstates
+        eigvals_only (bool): If True, no wavefunctions are calculated
+
+    Returns:
+        1darray: Array containing the eigenvalues
+        ndarray: Array containing the eigenvectors from min_ev to max_ev as
+          column vectors (not returned if eigvals_only is set)
+    """
+    xplot = np.linspace(xmin, xmax, num=npoint, endpoint=True)
+    pot = np.asarray(pot, dtype=float)
+    indices = list(range(min_ev, max_ev + 1))
+    nstates = len(indices)
+    args = ([xplot] * nstates, [mass] * nstates, [pot] * nstates, indices,
+            [eigvals_only] * nstates)
+    if nworkers > 1 and nstates > 1:
+        with ProcessPoolExecutor(max_workers=nworkers) as executor:
+            states = list(executor.map(_numerov_state, *args))
+    else:
+        states = list(map(_numerov_state, *args))
+    energy = np.array([state[0] for state in states])
+    if eigvals_only:
+        return energy
+    evec = np.transpose(np.array([state[1] for state in states]))
+
+    # Eigenstates whose eigenvalues can not be told apart are mixed by the
+    # inverse iteration, they are replaced by an orthonormal set.
+    tolerance = 1e-10 * max(np.amax(abs(energy)), 1.0)
+    first = 0
+    for last in range(1, nstates + 1):
+        if last < nstates and energy[last] - energy[last - 1] < tolerance:
+            continue
+        if last - first > 1:
+            evec[:, first:last] = _numerov_degenerate(
+                xplot, mass, pot, np.mean(energy[first:last]), last - first)
+        first = last
+    return energy, evec
+
+
 def _get_wf_array(xplot, min_ev, max_ev, evec):
     """Calculates the array of the wavefunctions in the\n
     x1 Psi1(x1) Psi2(x1)\n
@@ -159,3 +937,153 @@ def _get_exp_unc(expx, unc):
     expvalues = np.vstack((expx, unc))
     expvalues = np.transpose(expvalues)
     return expvalues
+
+
+def solve_problem(inp, energies_only=False, parity=True, engine='matrix',
+                  nworkers=1):
+    """Solves the problem described by the dictionary returned by
+    `_read_schrodinger` and calculates the data of the result files. If the
+    potential is symmetric about the centre of the grid, the even and odd
+    eigenstates are solved separately by the matrix engine (see
+    `solve_parity`). The numerov engine (see `solve_numerov`) only calculates
+    the requested eigenstates.
+
+    Args:
+        inp (dict): Dictionary describing the problem
+        energies_only (bool): If True, only the energies are calculated
+        parity (bool): If False, symmetric potentials are not detected
+        engine (str): Either 'matrix' or 'numerov'
+        nworkers (int): Number of processes of the numerov engine
+
+    Returns:
+        dict: Dictionary containing the energies (`energy`) and the potential
+          with the corresponding x-values (`potential`). Unless energies_only
+          is set it also contains the expected values and uncertainties
+          (`expvalues`) and the wavefunctions (`wavefuncs`) in the format of
+          the result files. For symmetric potentials it contains the parity
+          of the eigenstates (`parity`).
+    """
+    xplot = np.linspace(inp['xmin'], inp['xmax'], num=inp['npoint'],
+                        endpoint=True)
+    pot = pot_calc(xplot, inp['pot'], inp['reg_type'])
+    args = (inp['xmin'], inp['xmax'], inp['npoint'], inp['mass'], pot)
+    symmetric = parity and _is_symmetric(pot)
+
+    result = dict()
+    result['potential'] = np.transpose(np.vstack((xplot, pot)))
+
+    if engine == 'numerov':
+        if energies_only:
+            result['energy'] = solve_numerov(*args, inp['min_ev'],
+                                             inp['max_ev'], nworkers, True)
+            return result
+        energy, evec = solve_numerov(*args, inp['min_ev'], inp['max_ev'],
+                                     nworkers)
+        nstates = inp['max_ev'] - inp['min_ev'] + 1
+        result['energy'] = energy
+        result['wavefuncs'] = _get_wf_array(xplot, 1, nstates, evec)
+        expectedx = expected_values(xplot, evec, 1, nstates)
+        uncertainty = uncertainty_x(xplot, evec, 1, nstates)
+        result['expvalues'] = _get_exp_unc(expectedx, uncertainty)
+        return result
+    elif engine != 'matrix':
+        raise ValueError("Unknown engine '{}'.".format(engine))
+
+    if energies_only:
+        if symmetric:
+            energy, parities = solve_parity(*args, max_ev=inp['max_ev'],
+                                            eigvals_only=True)
+            result['energy'] = energy[inp['min_ev'] - 1:]
+            result['parity'] = parities[inp['min_ev'] - 1:]
+        else:
+            result['energy'] = solve_energies(*args, inp['min_ev'],
+                                              inp['max_ev'])
+        return result
+
+    if symmetric:
+        energy, evec, parities = solve_parity(*args, max_ev=inp['max_ev'])
+        result['parity'] = parities[inp['min_ev'] - 1:]
+    else:
+        energy, evec = solve_seq(*args)
+    result['energy'] = energy[inp['min_ev'] - 1: inp['max_ev']]
+    result['wavefuncs'] = _get_wf_array(xplot, inp['min_ev'], inp['max_ev'],
+                                        evec)
+    expectedx = expected_values(xplot, evec, inp['min_ev'], inp['max_ev'])
+    uncertainty = uncertainty_x(xplot, evec, inp['min_ev'], inp['max_ev'])
+    result['expvalues'] = _get_exp_unc(expectedx, uncertainty)
+    return result
+
+
+BATCH_KEYS = ['xmin', 'xmax', 'npoint', 'min_ev', 'max_ev']
+
+
+def solve_problem_batch(inps, energies_only=False, parity=True):
+    """Solves a batch of problems described by dictionaries returned by
+    `_read_schrodinger`, which share the grid and the requested eigenstates,
+    and calculates the data of the result files as stacked arrays. Like in
+    `solve_problem`, problems with a symmetric potential are solved together
+    by even and odd eigenstates (see `solve_parity_batch`), all others
+    together by `solve_batch`.
+
+    Args:
+        inps (list): Dictionaries describing the problems
+        energies_only (bool): If True, only the energies are calculated
+        parity (bool): If False, symmetric potentials are not detected
+
+    Returns:
+        dict: Dictionary containing the stacked data of `solve_problem`,
+          indexed by the problem first. The parity (`parity`) is 0 for the
+          eigenstates of problems without a symmetric potential.
+    """
+    inp = inps[0]
+    for other in inps[1:]:
+        if any(other[key] != inp[key] for key in BATCH_KEYS):
+            raise ValueError("Problems of a batch have to share the grid "
+                             "and the requested eigenstates.")
+    xplot = np.linspace(inp['xmin'], inp['xmax'], num=inp['npoint'],
+                        endpoint=True)
+    pots = np.array([pot_calc(xplot, other['pot'], other['reg_type'])
+                     for other in inps])
+    masses = np.array([other['mass'] for other in inps])
+    symmetric = _is_symmetric(pots) & parity
+    nbatch = len(inps)
+    nstates = inp['max_ev'] - inp['min_ev'] + 1
+
+    result = dict()
+    result['potential'] = np.stack(
+        (np.broadcast_to(xplot, pots.shape), pots), axis=2)
+    energy = np.zeros((nbatch, nstates), dtype=float)
+    parities = np.zeros((nbatch, nstates), dtype=int)
+    if not energies_only:
+        evec = np.zeros((nbatch, inp['npoint'], nstates), dtype=float)
+
+    args = (inp['xmin'], inp['xmax'], inp['npoint'])
+    other = ~symmetric
+    if np.any(other):
+        solution = solve_batch(*args, masses[other], pots[other],
+                               inp['min_ev'], inp['max_ev'], energies_only)
+        if energies_only:
+            energy[other] = solution
+        else:
+            energy[other], evec[other] = solution
+    if np.any(symmetric):
+        solution = solve_parity_batch(*args, masses[symmetric],
+                                      pots[symmetric], inp['min_ev'],
+                                      inp['max_ev'], energies_only)
+        energy[symmetric] = solution[0]
+        parities[symmetric] = solution[-1]
+        if not energies_only:
+            evec[symmetric] = solution[1]
+
+    result['energy'] = energy
+    if np.any(symmetric):
+        result['parity'] = parities
+    if energies_only:
+        return result
+
+    expectedx, uncertainty = _batch_observables(xplot, evec)
+    result['wavefuncs'] = np.concatenate(
+        (np.broadcast_to(xplot[np.newaxis, :, np.newaxis],
+                         (nbatch, len(xplot), 1)), evec), axis=2)
+    result['expvalues'] = np.stack((expectedx, uncertainty), axis=2)
+    return result
@@ -6,6 +6,7 @@ visualized in a seperate plot."""
 
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.widgets import Slider
 
 
 def _scale_plot(min_ev, max_ev, energy, evec, index_ev, rtol, atol):
@@ -71,11 +72,10 @@ def _plot_set_unc(ymin, ymax, unc):
     ax.spines['left'].set_linewidth(1.2)
 
 
-def pot_plot_multi(xmin, xmax, min_ev, max_ev, energy, evec, pot, xplot, ydiff,
-                   expx, unc, scale):
-    """Creates a graphical plot. It shows the potential, the eigenvalues, the
-    wavefunctions, the expected values of the position of the particle. Within
-    a second plot it shows the uncertainty of the expected position.
+def _draw_multi(xmin, xmax, min_ev, max_ev, energy, evec, pot, xplot, ydiff,
+                expx, unc, scale, animated=False):
+    """Draws the plots of `pot_plot_multi` into a new figure and returns the
+    artists which depend on the solution, so they can be updated in place.
 
     Args:
         xmin (int): Lower bound of the x values
@@ -91,6 +91,14 @@ def pot_plot_multi(xmin, xmax, min_ev, max_ev, energy, evec, pot, xplot, ydiff,
         expx (1darray): Expected values of the position
         unc (1darray): Uncertainty of the position.
         scale (float): Scaling factor of the wavefunctions.
+        animated (bool): Marks the returned artists as animated for blitting
+
+    Returns:
+        Figure: Figure containing the plots
+        dict: Lists of the artists of the energy levels (`levels`,
+          `unclevels`), the wavefunctions (`wfs`), the expected values
+          (`expx`), the uncertainties (`unc`), the potential (`pot`) and the
+          scaling factors of the wavefunctions (`scales`)
     """
     atol = 0.02 * ydiff
     rtol = 0.02 * ydiff
@@ -105,7 +113,10 @@ def pot_plot_multi(xmin, xmax, min_ev, max_ev, energy, evec, pot, xplot, ydiff,
     ymin = np.amin(energy) - np.amax(min_scale * evec[:, 0]) - 0.05 * ydiff
     ymax = energy[-1] + np.amax(max_scale * evec[:, -1]) + 0.05 * ydiff
 
-    plt.figure(figsize=(9, 6), dpi=80)
+    artists = {'levels': [], 'wfs': [], 'expx': [], 'unclevels': [],
+               'unc': [], 'pot': [], 'scales': []}
+
+    fig = plt.figure(figsize=(9, 6), dpi=80)
 
     plt.subplot(1, 2, 1)
     _plot_set_wf(xmin, xmax, ymin, ymax)
@@ -115,26 +126,172 @@ def pot_plot_multi(xmin, xmax, min_ev, max_ev, energy, evec, pot, xplot, ydiff,
             color = 'blue'
         else:
             color = 'red'
-        plt.hlines(energy[ii], xmin, xmax, color='lightgray', linewidth=2.5,
-                   zorder=1)
+        artists['levels'].append(
+            plt.hlines(energy[ii], xmin, xmax, color='lightgray',
+                       linewidth=2.5, zorder=1, animated=animated))
         if scale is None:
             scale = _scale_plot(min_ev, max_ev, energy, evec, ii, rtol, atol)
-        plt.plot(expx[ii], energy[ii], 'x', color='green', markersize=12,
-                 markeredgewidth=1.5, zorder=3)
-        plt.plot(xplot, scale * evec[:, ii] + energy[ii], color=color,
-                 linewidth=2.5, zorder=2)
-    plt.plot(xplot, pot, color='black', linewidth=2, zorder=0)
+        artists['scales'].append(scale)
+        artists['expx'] += plt.plot(expx[ii], energy[ii], 'x', color='green',
+                                    markersize=12, markeredgewidth=1.5,
+                                    zorder=3, animated=animated)
+        artists['wfs'] += plt.plot(xplot, scale * evec[:, ii] + energy[ii],
+                                   color=color, linewidth=2.5, zorder=2,
+                                   animated=animated)
+    artists['pot'] += plt.plot(xplot, pot, color='black', linewidth=2,
+                               zorder=0, animated=animated)
 
     plt.subplot(1, 2, 2)
     _plot_set_unc(ymin, ymax, unc)
 
     for ii in range(0, max_ev - min_ev + 1):
-        plt.hlines(energy[ii], xmin, xmax, color='lightgray', linewidth=2.5,
-                   zorder=1)
-        plt.plot(unc[ii], energy[ii], marker='+', color='magenta',
-                 markersize=17, markeredgewidth=1.85, zorder=2)
+        artists['unclevels'].append(
+            plt.hlines(energy[ii], xmin, xmax, color='lightgray',
+                       linewidth=2.5, zorder=1, animated=animated))
+        artists['unc'] += plt.plot(unc[ii], energy[ii], marker='+',
+                                   color='magenta', markersize=17,
+                                   markeredgewidth=1.85, zorder=2,
+                                   animated=animated)
+
+    return fig, artists
+
+
+def pot_plot_multi(xmin, xmax, min_ev, max_ev, energy, evec, pot, xplot, ydiff,
+                   expx, unc, scale):
+    """Creates a graphical plot. It shows the potential, the eigenvalues, the
+    wavefunctions, the expected values of the position of the particle. Within
+    a second plot it shows the uncertainty of the expected position.
+
+    Args:
+        xmin (int): Lower bound of the x values
+        xmax (int): Upper bound of the x values
+        min_ev (int): Lower bound of the eigenvalues which should be visualized
+        max_ev (int): Upper bound of the eigenvalues which should be visualized
+        energy (1darray): Array of eigenvalues
+        evec (ndarray): Array containing the wavefunctions as column vectors
+        pot (1darray): Interpolation of the potential at the xplot values
+        xplot (1darray): Values where the potential is defined
+        ydiff (int): Absolute difference between the lowest and the highest
+            eigenvalue
+        expx (1darray): Expected values of the position
+        unc (1darray): Uncertainty of the position.
+        scale (float): Scaling factor of the wavefunctions.
+    """
+    _draw_multi(xmin, xmax, min_ev, max_ev, energy, evec, pot, xplot, ydiff,
+                expx, unc, scale)
+
+    plt.show()
+
+
+def _update_multi(artists, xmin, xmax, energy, evec, pot, expx, unc):
+    """Updates the artists returned by `_draw_multi` in place to show another
+    solution on the same grid.
+
+    Args:
+        artists (dict): Artists returned by `_draw_multi`
+        xmin (int): Lower bound of the x values
+        xmax (int): Upper bound of the x values
+        energy (1darray): Array of eigenvalues
+        evec (ndarray): Array containing the wavefunctions as column vectors
+        pot (1darray): Interpolation of the potential at the xplot values
+        expx (1darray): Expected values of the position
+        unc (1darray): Uncertainty of the position.
+    """
+    for ii in range(len(artists['wfs'])):
+        segment = [[[xmin, energy[ii]], [xmax, energy[ii]]]]
+        artists['levels'][ii].set_segments(segment)
+        artists['unclevels'][ii].set_segments(segment)
+        artists['wfs'][ii].set_ydata(artists['scales'][ii] * evec[:, ii]
+                                     + energy[ii])
+        artists['expx'][ii].set_data([expx[ii]], [energy[ii]])
+        artists['unc'][ii].set_data([unc[ii]], [energy[ii]])
+    artists['pot'][0].set_ydata(pot)
+
+
+def pot_plot_sweep(xmin, xmax, energy, evec, pot, xplot, expx, unc, scale):
+    """Creates the graphical plot of `pot_plot_multi` for a whole sweep of
+    solutions on the same grid with a slider (or the left and right arrow
+    keys) to step between them. The artists are updated in place and redrawn
+    with blitting, so the figure is never rebuilt.
+
+    Args:
+        xmin (int): Lower bound of the x values
+        xmax (int): Upper bound of the x values
+        energy (2darray): Eigenvalues of every sweep point as rows
+        evec (ndarray): Wavefunctions of every sweep point, indexed by sweep
+            point, x value and eigenstate
+        pot (2darray): Potentials of every sweep point as rows
+        xplot (1darray): Values where the potential is defined
+        expx (2darray): Expected values of the position of every sweep point
+        unc (2darray): Uncertainties of the position of every sweep point
+        scale (float): Scaling factor of the wavefunctions.
+    """
+    nsweep, nev = energy.shape
+    if scale is None:
+        ydiff = abs(np.amax(energy[0]) - np.amin(energy[0]))
+        if nev > 1:
+            scale = _scale_plot(1, nev, energy[0], evec[0], 0, 0.02 * ydiff,
+                                0.02 * ydiff)
+        else:
+            scale = 0.4 * abs(energy[0, 0] - np.amin(pot[0])) \
+                / np.amax(abs(evec[0, :, 0]))
+    # The limits have to fit every sweep point, since blitting keeps them.
+    ydiff = abs(np.amax(energy) - np.amin(energy))
+    ydiff = ydiff if ydiff > 0 else 1.0
+    ymin = np.amin(energy[:, 0] - np.amax(scale * evec[:, :, 0], axis=1)) \
+        - 0.05 * ydiff
+    ymax = np.amax(energy[:, -1] + np.amax(scale * evec[:, :, -1], axis=1)) \
+        + 0.05 * ydiff
+
+    fig, artists = _draw_multi(xmin, xmax, 1, nev, energy[0], evec[0], pot[0],
+                               xplot, ydiff, expx[0], unc[0], scale,
+                               animated=True)
+    axes = fig.get_axes()
+    axes[0].set_ylim(ymin, ymax)
+    axes[1].set_ylim(ymin, ymax)
+    axes[1].set_xlim(0, 1.1 * np.amax(unc))
+    fig.subplots_adjust(bottom=0.2)
+
+    slider_ax = fig.add_axes([0.15, 0.05, 0.7, 0.03])
+    slider = Slider(slider_ax, 'Sweep', 0, nsweep - 1, valinit=0, valstep=1,
+                    valfmt='%d')
+    slider.drawon = False
+
+    animated = artists['levels'] + artists['wfs'] + artists['expx'] \
+        + artists['pot'] + artists['unclevels'] + artists['unc']
+    background = {}
+
+    def _blit():
+        fig.canvas.restore_region(background['bg'])
+        for artist in animated:
+            artist.axes.draw_artist(artist)
+        fig.draw_artist(slider_ax)
+        fig.canvas.blit(fig.bbox)
+
+    def _on_draw(event):
+        background['bg'] = fig.canvas.copy_from_bbox(fig.bbox)
+        for artist in animated:
+            artist.axes.draw_artist(artist)
+
+    def _on_change(value):
+        ii = int(value)
+        _update_multi(artists, xmin, xmax, energy[ii], evec[ii], pot[ii],
+                      expx[ii], unc[ii])
+        if 'bg' in background:
+            _blit()
+
+    def _on_key(event):
+        if event.key == 'right':
+            slider.set_val(min(slider.val + 1, nsweep - 1))
+        elif event.key == 'left':
+            slider.set_val(max(slider.val - 1, 0))
+
+    fig.canvas.mpl_connect('draw_event', _on_draw)
+    fig.canvas.mpl_connect('key_press_event', _on_key)
+    slider.on_changed(_on_change)
 
     plt.show()
+    return fig, slider
 
 
 def pot_plot_one(xmin, xmax, energy, evec, pot, xplot, ydiff, expx, unc,
@@ -4,7 +4,10 @@ schrodinger equation."""
 
 import numpy as np
 import pytest
-from calculus.calc import pot_calc, solve_seq
+from calculus.calc import (pot_calc, solve_seq, solve_energies, count_states,
+                           solve_parity, solve_numerov, solve_problem,
+                           solve_problem_batch, _numerov_factors,
+                           _numerov_integrate)
 from calculus._file_io import _read_data, _read_schrodinger
 
 
@@ -46,3 +49,186 @@ def test_energy(problem):
         assert np.allclose(expectede, calculatede, rtol=1e-02, atol=1e-12)
     else:
         assert np.allclose(expectede, calculatede, rtol=1e-15, atol=1e-15)
+
+
+@pytest.mark.parametrize('problem', _LIST)
+def test_energies_only(problem):
+    """Tests that the energies only solution and the counting of the states
+    below a threshold agree with the full solution."""
+    inp = _read_schrodinger(_DIRECTORYFILE, problem[0])
+    xplot = np.linspace(inp['xmin'], inp['xmax'], num=inp['npoint'],
+                        endpoint=True)
+    pot = pot_calc(xplot, inp['pot'], inp['reg_type'])
+
+    energy = solve_seq(inp['xmin'], inp['xmax'], inp['npoint'], inp['mass'],
+                       pot)[0]
+    calculatede = solve_energies(inp['xmin'], inp['xmax'], inp['npoint'],
+                                 inp['mass'], pot, inp['min_ev'],
+                                 inp['max_ev'])
+    expectede = energy[inp['min_ev'] - 1:inp['max_ev']]
+    assert np.allclose(expectede, calculatede, rtol=1e-10, atol=1e-10)
+
+    # Thresholds between nearly degenerate states are not resolvable.
+    gaps = energy[1:21] - energy[0:20]
+    thresholds = 0.5 * (energy[0:20] + energy[1:21])[gaps > 1e-6]
+    calculatedn = count_states(inp['xmin'], inp['xmax'], inp['npoint'],
+                               inp['mass'], pot, thresholds)
+    expectedn = np.array([np.sum(energy < ee) for ee in thresholds])
+    assert np.all(expectedn == calculatedn)
+
+
+def test_count_states_at_eigenvalue():
+    """Tests that an eigenvalue is not counted below itself on any grid."""
+    for npoint in range(2, 201):
+        xplot = np.linspace(-5.0, 5.0, npoint)
+        pot = 0.5 * xplot**2
+        energy = solve_energies(-5.0, 5.0, npoint, 1.0, pot)
+        calculatedn = count_states(-5.0, 5.0, npoint, 1.0, pot, energy)
+        assert np.all(calculatedn == np.arange(npoint))
+
+
+@pytest.mark.parametrize('problem', _LIST[0:5])
+def test_parity(problem):
+    """Tests that solving the even and odd states of the symmetric potentials
+    separately gives the eigenvalues of the full solution and eigenvectors of
+    the labeled parity."""
+    inp = _read_schrodinger(_DIRECTORYFILE, problem[0])
+    xplot = np.linspace(inp['xmin'], inp['xmax'], num=inp['npoint'],
+                        endpoint=True)
+    pot = pot_calc(xplot, inp['pot'], inp['reg_type'])
+
+    expectede = solve_seq(inp['xmin'], inp['xmax'], inp['npoint'],
+                          inp['mass'], pot)[0][0:20]
+    calculatede, evec, parity = solve_parity(inp['xmin'], inp['xmax'],
+                                             inp['npoint'], inp['mass'], pot,
+                                             max_ev=20)
+    assert np.allclose(expectede, calculatede, rtol=1e-10, atol=1e-10)
+    assert np.allclose(evec[::-1] * parity, evec, rtol=0, atol=1e-14)
+    assert np.allclose(np.dot(evec.T, evec), np.eye(20), rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('problem', _LIST[0:3:2])
+def test_numerov(problem):
+    """Tests the energies of the numerov engine for the problems with analytic
+    solutions (rtol=1e-08, atol=1e-12) and that its wavefunctions agree with
+    the ones of the matrix solution."""
+    expectede = _read_data(_DIRECTORYTEST, problem[1])[2:6]
+
+    inp = _read_schrodinger(_DIRECTORYFILE, problem[0])
+    xplot = np.linspace(inp['xmin'], inp['xmax'], num=inp['npoint'],
+                        endpoint=True)
+    pot = pot_calc(xplot, inp['pot'], inp['reg_type'])
+
+    calculatede, evec = solve_numerov(inp['xmin'], inp['xmax'],
+                                      inp['npoint'], inp['mass'], pot, 3, 6,
+                                      nworkers=2)
+    assert np.allclose(expectede, calculatede, rtol=1e-08, atol=1e-12)
+
+    delta = xplot[1] - xplot[0]
+    seqevec = solve_seq(inp['xmin'], inp['xmax'], inp['npoint'], inp['mass'],
+                        pot)[1][:, 2:6]
+    seqevec /= np.sqrt(delta * np.sum(seqevec**2, axis=0))
+    overlap = delta * np.sum(seqevec * evec, axis=0)
+    assert np.allclose(abs(overlap), 1.0, rtol=0, atol=1e-4)
+
+
+def test_batch():
+    """Tests that solving a batch of problems on the same grid, with and
+    without a symmetric potential, gives the results of solving every problem
+    on its own."""
+    inps = []
+    for problem in _LIST[1:3]:
+        inp = _read_schrodinger(_DIRECTORYFILE, problem[0])
+        inp['xmin'], inp['xmax'] = -2.0, 2.0
+        inp['min_ev'], inp['max_ev'] = 2, 6
+        for mass in [1.0, 2.0]:
+            inps.append(dict(inp, mass=mass))
+
+    # A linear ramp, which is not symmetric.
+    inps.append(dict(inps[0], reg_type='linear',
+                     pot=np.array([[-2.0, 0.0], [2.0, 5.0]])))
+
+    batch = solve_problem_batch(inps)
+    for ii, inp in enumerate(inps):
+        single = solve_problem(inp)
+        if 'parity' in single:
+            assert np.all(single['parity'] == batch['parity'][ii])
+        else:
+            assert not np.any(batch['parity'][ii])
+        assert np.allclose(single['energy'], batch['energy'][ii],
+                           rtol=1e-10, atol=1e-10)
+        assert np.allclose(single['expvalues'], batch['expvalues'][ii],
+                           rtol=1e-08, atol=1e-08)
+        assert np.allclose(abs(single['wavefuncs']),
+                           abs(batch['wavefuncs'][ii]), rtol=1e-08,
+                           atol=1e-08)
+
+
+@pytest.mark.parametrize('npoint', [300, 301])
+@pytest.mark.parametrize('energies_only', [False, True])
+def test_batch_parity(npoint, energies_only):
+    """Tests that the even and odd blocks of a batch of symmetric potentials
+    with an even and an odd number of points, which are solved as stacks,
+    give the results of solving every problem on its own."""
+    inp = _read_schrodinger(_DIRECTORYFILE, _LIST[2][0])
+    inp['npoint'], inp['min_ev'], inp['max_ev'] = npoint, 2, 7
+    inps = [dict(inp, mass=mass) for mass in np.linspace(0.5, 2.0, 16)]
+
+    batch = solve_problem_batch(inps, energies_only)
+    for ii, inp in enumerate(inps):
+        single = solve_problem(inp, energies_only)
+        assert np.all(single['parity'] == batch['parity'][ii])
+        assert np.allclose(single['energy'], batch['energy'][ii],
+                           rtol=1e-10, atol=1e-10)
+        if not energies_only:
+            assert np.allclose(abs(single['wavefuncs']),
+                               abs(batch['wavefuncs'][ii]), rtol=1e-08,
+                               atol=1e-08)
+
+
+def test_numerov_integrate():
+    """Tests that the chunked integration of the Numerov method gives the
+    wavefunction and the nodes of the plain recurrence, also when the
+    wavefunction grows beyond the floating point range within a barrier."""
+    xplot = np.linspace(-10.0, 10.0, 20001)
+    pot = np.where(abs(xplot) < 1.0, 0.0, 1e4)
+    factors = _numerov_factors(xplot, 1.0, pot, 30.0)
+    psi, nodes = _numerov_integrate(factors, len(xplot) - 1)
+
+    expected = [0.0, 1.0]
+    expnodes = 0
+    for ii in range(1, len(xplot) - 1):
+        expected.append(((12 - 10 * factors[ii]) * expected[ii]
+                         - factors[ii - 1] * expected[ii - 1])
+                        / factors[ii + 1])
+        if (expected[-1] < 0) != (expected[-2] < 0):
+            expnodes += 1
+        if abs(expected[-1]) > 1e100:
+            expected = [value * 1e-100 for value in expected]
+    expected = np.array(expected) / np.amax(np.abs(expected))
+    assert nodes == expnodes
+    assert np.allclose(psi, expected, rtol=1e-08, atol=1e-300)
+
+
+@pytest.mark.parametrize('problem', _LIST[3:5])
+def test_numerov_double_well(problem):
+    """Tests that the numerov engine returns orthonormal even and odd
+    eigenstates for the double oscillators, whose pairs of eigenvalues are
+    degenerate within the floating point precision."""
+    inp = _read_schrodinger(_DIRECTORYFILE, problem[0])
+    xplot = np.linspace(inp['xmin'], inp['xmax'], num=inp['npoint'],
+                        endpoint=True)
+    pot = pot_calc(xplot, inp['pot'], inp['reg_type'])
+
+    calculatede, evec = solve_numerov(inp['xmin'], inp['xmax'],
+                                      inp['npoint'], inp['mass'], pot, 1, 8)
+    expectede = solve_seq(inp['xmin'], inp['xmax'], inp['npoint'],
+                          inp['mass'], pot)[0][0:8]
+    assert np.allclose(expectede, calculatede, rtol=2e-02, atol=1e-12)
+
+    delta = xplot[1] - xplot[0]
+    overlap = delta * np.dot(evec.T, evec)
+    assert np.allclose(overlap, np.eye(8), rtol=0, atol=1e-05)
+    parity = delta * np.sum(evec * evec[::-1], axis=0)
+    assert np.allclose(parity, [1, -1, 1, -1, 1, -1, 1, -1], rtol=0,
+                       atol=1e-06)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Script testing the manifest and the result files of batch runs."""
+
+import os
+import shutil
+import numpy as np
+import pytest
+from calculus.calc import solve_problem
+from calculus._file_io import (_read_schrodinger, _read_files, _input_hash,
+                               _read_manifest, _append_manifest,
+                               _write_solution_safe)
+from calculus._batch import solve_directory
+
+
+_DIRECTORYFILE = 'tests'
+
+
+def test_manifest(tmp_path):
+    """Tests that the manifest survives an incompletely written last line,
+    that the input hash depends on the options and that the result files
+    replace the ones of an interrupted run."""
+    manifest = str(tmp_path / 'manifest.jsonl')
+    inphash = _input_hash(_DIRECTORYFILE, 'harm_osc.inp', False)
+    assert inphash != _input_hash(_DIRECTORYFILE, 'harm_osc.inp', True)
+    assert inphash != _input_hash(_DIRECTORYFILE, 'morse.inp', False)
+
+    _append_manifest(manifest, {'input': 'harm_osc.inp', 'hash': inphash,
+                                'output': 'harm_osc'})
+    with open(manifest, 'a') as fp:
+        fp.write('{"input": "morse.inp", "ha')
+    entries = _read_manifest(manifest)
+    assert list(entries) == ['harm_osc.inp']
+    assert entries['harm_osc.inp']['hash'] == inphash
+
+    _append_manifest(manifest, {'input': 'morse.inp', 'hash': 'xx',
+                                'output': 'morse'})
+    assert list(_read_manifest(manifest)) == ['harm_osc.inp', 'morse.inp']
+
+    output = str(tmp_path / 'harm_osc')
+    os.makedirs(output)
+    with open(os.path.join(output, 'energies.dat'), 'w') as fp:
+        fp.write('1.0\n2.')
+    result = solve_problem(_read_schrodinger(_DIRECTORYFILE, 'harm_osc.inp'))
+    _write_solution_safe(output, result)
+    energy = _read_files(output)[0]
+    assert np.allclose(result['energy'], energy)
+    assert not os.path.exists(output + '.tmp')
+
+
+def test_resume(tmp_path):
+    """Tests that a repeated batch run skips the finished problems and solves
+    the problems whose input, options or output directory changed."""
+    batchdir = tmp_path / 'inp'
+    outdir = str(tmp_path / 'out')
+    os.makedirs(batchdir)
+    names = ['fin_square_well.inp', 'harm_osc.inp', 'inf_square_well.inp']
+    for name in names:
+        shutil.copy(os.path.join(_DIRECTORYFILE, name), batchdir)
+
+    assert solve_directory(str(batchdir), outdir, chunksize=2) == (names, {})
+    energy = _read_files(os.path.join(outdir, 'harm_osc'))[0]
+    assert solve_directory(str(batchdir), outdir) == ([], {})
+
+    with open(batchdir / 'harm_osc.inp', 'a') as fp:
+        fp.write('\n')
+    assert solve_directory(str(batchdir), outdir) == (['harm_osc.inp'], {})
+    assert np.allclose(_read_files(os.path.join(outdir, 'harm_osc'))[0],
+                       energy)
+
+    shutil.rmtree(os.path.join(outdir, 'fin_square_well'))
+    assert solve_directory(str(batchdir), outdir) == \
+        (['fin_square_well.inp'], {})
+
+    assert solve_directory(str(batchdir), outdir, energies_only=True)[0] == \
+        names
+
+    with open(batchdir / 'broken.inp', 'w') as fp:
+        fp.write('1.0\n')
+    solved, failed = solve_directory(str(batchdir), outdir,
+                                     energies_only=True)
+    assert solved == [] and list(failed) == ['broken.inp']
+
+    with pytest.raises(ValueError):
+        solve_directory(str(batchdir), outdir, chunksize=0)
+
+
+def test_foreign_directory(tmp_path):
+    """Tests that a batch run does not replace a directory which is neither
+    recorded in the manifest nor only contains result files."""
+    batchdir = tmp_path / 'inp'
+    outdir = tmp_path / 'out'
+    os.makedirs(batchdir)
+    for name in ['harm_osc.inp', 'morse.inp']:
+        shutil.copy(os.path.join(_DIRECTORYFILE, name), batchdir)
+    os.makedirs(outdir / 'harm_osc')
+    with open(outdir / 'harm_osc' / 'notes.txt', 'w') as fp:
+        fp.write('keep\n')
+    os.makedirs(outdir / 'morse')
+    with open(outdir / 'morse' / 'energies.dat', 'w') as fp:
+        fp.write('1.0\n2.')
+
+    solved, failed = solve_directory(str(batchdir), str(outdir))
+    assert solved == ['morse.inp'] and list(failed) == ['harm_osc.inp']
+    assert os.listdir(outdir / 'harm_osc') == ['notes.txt']
+    with pytest.raises(OSError):
+        _write_solution_safe(str(outdir / 'harm_osc'), {})
@@ -39,3 +39,60 @@ def test_pot(problem):
     calculated_pot = pot_calc(xplot, inp['pot'], inp['reg_type'])
 
     assert np.allclose(expected_pot, calculated_pot, rtol=1e-14, atol=1e-14)
+
+
+@pytest.mark.parametrize('tablefile', ['table.npy', 'table.bin', 'table.dat'])
+def test_pot_table_file(tmp_path, tablefile):
+    """Test for potentials whose table is stored in a separate file. They have
+    to give the same interpolation as the inline table of the double
+    oscillator."""
+    inp = _read_schrodinger(_DIRECTORYFILE, 'double_lin.inp')
+    table = np.ascontiguousarray(inp['pot'], dtype=np.float64)
+    tablepath = str(tmp_path / tablefile)
+    if tablefile.endswith('.npy'):
+        np.save(tablepath, table)
+    elif tablefile.endswith('.bin'):
+        table.tofile(tablepath)
+    else:
+        np.savetxt(tablepath, table)
+
+    with open(_DIRECTORYFILE + '/double_lin.inp') as fp:
+        header = fp.readlines()[0:5]
+    with open(str(tmp_path / 'schrodinger.inp'), 'w') as fp:
+        fp.writelines(header)
+        fp.write('{} # potential table\n'.format(tablefile))
+
+    tableinp = _read_schrodinger(str(tmp_path), 'schrodinger.inp')
+    xplot = np.linspace(inp['xmin'], inp['xmax'], num=inp['npoint'],
+                        endpoint=True)
+    expected_pot = pot_calc(xplot, inp['pot'], inp['reg_type'])
+    calculated_pot = pot_calc(xplot, tableinp['pot'], tableinp['reg_type'])
+
+    assert np.allclose(expected_pot, calculated_pot, rtol=1e-14, atol=1e-14)
+
+
+def test_pot_unsorted(tmp_path):
+    """Test for potentials whose xy declarations are not sorted by x. Inline
+    tables are sorted, memory-mapped tables are rejected where they are
+    read."""
+    xplot = np.linspace(-2.0, 2.0, num=101, endpoint=True)
+    table = np.array([[2.0, 0.0], [-2.0, 0.0], [0.5, 1.0], [-0.5, 1.0]])
+    order = np.argsort(table[:, 0])
+
+    for interpoltype in ['linear', 'cspline']:
+        expected_pot = pot_calc(xplot, table[order], interpoltype)
+        calculated_pot = pot_calc(xplot, table, interpoltype)
+        assert np.allclose(expected_pot, calculated_pot, rtol=1e-14,
+                           atol=1e-14)
+
+    tablepath = str(tmp_path / 'table.npy')
+    np.save(tablepath, table[[1, 2, 3, 0]])
+    with pytest.raises(ValueError, match='sorted'):
+        pot_calc(xplot, np.load(tablepath, mmap_mode='r'), 'linear')
+
+    # Only the part of a memory-mapped table bracketing xplot is read.
+    np.save(tablepath, np.vstack((table[order], [[8.0, 0.0], [4.0, 0.0]])))
+    calculated_pot = pot_calc(xplot, np.load(tablepath, mmap_mode='r'),
+                              'linear')
+    assert np.allclose(pot_calc(xplot, table[order], 'linear'),
+                       calculated_pot, rtol=1e-14, atol=1e-14)
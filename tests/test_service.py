@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Script testing the solve service."""
+
+import socket
+import threading
+import numpy as np
+import pytest
+from calculus.calc import solve_problem
+from calculus._file_io import _read_schrodinger, _read_data
+from calculus._service import SolveServer, request
+
+
+_DIRECTORYFILE = 'tests'
+
+
+def test_service(tmp_path):
+    """Tests that the service returns the same energies and expected values
+    as the solver, writes files only on request and reports errors."""
+    path = str(tmp_path / 'schrodinger.sock')
+    server = SolveServer(path, 1, 1)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        inp = _read_schrodinger(_DIRECTORYFILE, 'harm_osc.inp')
+        expected = solve_problem(inp)
+
+        problem = dict(inp)
+        problem['pot'] = inp['pot'].tolist()
+        response = request(path, {'problem': problem})
+        assert response['status'] == 'ok'
+        assert np.allclose(expected['energy'], response['energy'])
+        assert np.allclose(expected['expvalues'], response['expvalues'])
+        assert not list(tmp_path.glob('*.dat'))
+
+        response = request(path, {'indir': _DIRECTORYFILE,
+                                  'file': 'harm_osc.inp',
+                                  'energies_only': True,
+                                  'outdir': str(tmp_path)})
+        assert response['status'] == 'ok'
+        assert 'expvalues' not in response
+        energy = _read_data(str(tmp_path), 'energies.dat')
+        assert np.allclose(expected['energy'], energy)
+
+        response = request(path, {'indir': str(tmp_path / 'missing')})
+        assert response['status'] == 'error'
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_service_socket(tmp_path):
+    """Tests that the service only replaces the socket of a service which is
+    not running anymore."""
+    path = str(tmp_path / 'schrodinger.sock')
+    with open(path, 'w') as fp:
+        fp.write('no socket')
+    with pytest.raises(OSError):
+        SolveServer(path, 1, 1)
+
+    path = str(tmp_path / 'stale.sock')
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    server = SolveServer(path, 1, 1)
+    try:
+        with pytest.raises(OSError):
+            SolveServer(path, 1, 1)
+    finally:
+        server.server_close()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Script testing the reading of the results of a sweep."""
+
+import os
+import numpy as np
+from calculus.calc import solve_problem
+from calculus._file_io import _read_schrodinger, _write_solution, _read_sweep
+
+
+_DIRECTORYFILE = 'tests'
+
+
+def test_sweep_cache(tmp_path):
+    """Tests that the cached sweep data is rebuilt when a result file of the
+    sweep changes."""
+    inp = _read_schrodinger(_DIRECTORYFILE, 'harm_osc.inp')
+    directories = []
+    for mass in [1.0, 2.0]:
+        directory = str(tmp_path / 'mass{}'.format(mass))
+        os.makedirs(directory)
+        _write_solution(directory, solve_problem(dict(inp, mass=mass)))
+        directories.append(directory)
+    cachedir = str(tmp_path)
+
+    energy = np.array(_read_sweep(directories, cachedir)[0])
+    cached = _read_sweep(directories, cachedir)[0]
+    assert isinstance(cached, np.memmap)
+    assert np.allclose(energy, cached)
+
+    result = solve_problem(dict(inp, mass=8.0))
+    _write_solution(directories[1], result)
+    energy = _read_sweep(directories, cachedir)[0]
+    assert np.allclose(result['energy'], energy[1])